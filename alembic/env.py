@@ -9,7 +9,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Alembic needs to see your tables
-from app.models.core import User, Wallet, Transaction, APIKey
+from app.models import User, Wallet, Transaction, APIKey, LedgerEntry, WebhookEvent, PaystackRecipient
 
 # Alembic Config object
 config = context.config
@@ -19,16 +19,20 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 target_metadata = SQLModel.metadata
-database_url = os.getenv("DATABASE_URL")
 
 database_url = os.getenv("DATABASE_URL")
 if database_url:
     config.set_main_option("sqlalchemy.url", database_url)
 
 def run_migrations_offline() -> None:
-    """Run migrations in 'offline' mode."""
+    """Run migrations in 'offline' mode.
+
+    Only the dialect is needed to render SQL, so without DATABASE_URL
+    we fall back to ALEMBIC_DIALECT (default: postgresql).
+    """
+    url = database_url or f"{os.getenv('ALEMBIC_DIALECT', 'postgresql')}://"
     context.configure(
-        url=database_url,
+        url=url,
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
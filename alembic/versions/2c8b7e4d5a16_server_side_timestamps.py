@@ -0,0 +1,77 @@
+"""server side timestamps
+
+Revision ID: 2c8b7e4d5a16
+Revises: e7a3c5f09d12
+Create Date: 2026-10-15 12:14:51.118307
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c8b7e4d5a16'
+down_revision: Union[str, Sequence[str], None] = 'e7a3c5f09d12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMP_COLUMNS = [
+    ('user', 'created_at'),
+    ('user', 'updated_at'),
+    ('wallet', 'created_at'),
+    ('wallet', 'updated_at'),
+    ('transaction', 'created_at'),
+    ('apikey', 'created_at'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in TIMESTAMP_COLUMNS:
+        op.alter_column(table, column,
+                   existing_type=sa.DateTime(),
+                   type_=sa.TIMESTAMP(timezone=True),
+                   postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                   server_default=sa.text('now()'),
+                   existing_nullable=False)
+
+    # calculate_expiry() returns aware UTC datetimes, which asyncpg
+    # refuses to bind to a naive TIMESTAMP column. No server default here.
+    op.alter_column('apikey', 'expires_at',
+               existing_type=sa.DateTime(),
+               type_=sa.TIMESTAMP(timezone=True),
+               postgresql_using="expires_at AT TIME ZONE 'UTC'",
+               existing_nullable=False)
+
+    # ledger_entry is created by create_all() rather than a migration,
+    # so it may not exist yet on a fresh database.
+    op.execute(
+        "ALTER TABLE IF EXISTS ledger_entry "
+        "ALTER COLUMN created_at TYPE TIMESTAMP WITH TIME ZONE USING created_at AT TIME ZONE 'UTC', "
+        "ALTER COLUMN created_at SET DEFAULT now()"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "ALTER TABLE IF EXISTS ledger_entry "
+        "ALTER COLUMN created_at DROP DEFAULT, "
+        "ALTER COLUMN created_at TYPE TIMESTAMP WITHOUT TIME ZONE USING created_at AT TIME ZONE 'UTC'"
+    )
+
+    op.alter_column('apikey', 'expires_at',
+               existing_type=sa.TIMESTAMP(timezone=True),
+               type_=sa.DateTime(),
+               postgresql_using="expires_at AT TIME ZONE 'UTC'",
+               existing_nullable=False)
+
+    for table, column in reversed(TIMESTAMP_COLUMNS):
+        op.alter_column(table, column,
+                   existing_type=sa.TIMESTAMP(timezone=True),
+                   type_=sa.DateTime(),
+                   postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                   server_default=None,
+                   existing_nullable=False)
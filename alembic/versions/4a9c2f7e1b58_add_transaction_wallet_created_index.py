@@ -0,0 +1,34 @@
+"""add transaction wallet_created index
+
+Revision ID: 4a9c2f7e1b58
+Revises: 7f1e9b3c6d20
+Create Date: 2026-10-15 13:02:44.918305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9c2f7e1b58'
+down_revision: Union[str, Sequence[str], None] = '7f1e9b3c6d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # transaction is the hottest table; build the index without blocking writes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_txn_wallet_created', 'transaction', ['wallet_id', sa.text('created_at DESC')],
+            unique=False, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_txn_wallet_created', table_name='transaction', postgresql_concurrently=True)
@@ -0,0 +1,28 @@
+"""add apikey user_active index
+
+Revision ID: 5b2e8d41c9a7
+Revises: 3047f6419837
+Create Date: 2026-10-15 11:45:12.204118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8d41c9a7'
+down_revision: Union[str, Sequence[str], None] = '3047f6419837'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_apikey_user_active', 'apikey', ['user_id', 'is_active'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_apikey_user_active', table_name='apikey')
@@ -0,0 +1,37 @@
+"""wallet_number bigint
+
+Revision ID: 7f1e9b3c6d20
+Revises: 2c8b7e4d5a16
+Create Date: 2026-10-15 12:31:07.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f1e9b3c6d20'
+down_revision: Union[str, Sequence[str], None] = '2c8b7e4d5a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('wallet', 'wallet_number',
+               existing_type=sqlmodel.sql.sqltypes.AutoString(),
+               type_=sa.BigInteger(),
+               postgresql_using='wallet_number::bigint',
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('wallet', 'wallet_number',
+               existing_type=sa.BigInteger(),
+               type_=sqlmodel.sql.sqltypes.AutoString(),
+               postgresql_using="lpad(wallet_number::text, 10, '0')",
+               existing_nullable=False)
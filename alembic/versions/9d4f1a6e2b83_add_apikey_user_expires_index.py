@@ -0,0 +1,28 @@
+"""add apikey user_expires index
+
+Revision ID: 9d4f1a6e2b83
+Revises: 5b2e8d41c9a7
+Create Date: 2026-10-15 11:52:40.551263
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f1a6e2b83'
+down_revision: Union[str, Sequence[str], None] = '5b2e8d41c9a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_apikey_user_expires', 'apikey', ['user_id', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_apikey_user_expires', table_name='apikey')
@@ -0,0 +1,53 @@
+"""backfill deposit credits into wallet.balance
+
+Revision ID: a6e4b2d8c135
+Revises: f3a7c1e5b920
+Create Date: 2026-10-15 17:02:11.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e4b2d8c135'
+down_revision: Union[str, Sequence[str], None] = 'f3a7c1e5b920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The webhook used to write the deposit's ledger entry without touching
+# wallet.balance, which is now the balance of record. Transfers already kept
+# both in step, so only deposit entries are carried over.
+DEPOSIT_CREDITS = (
+    "SELECT l.wallet_id, SUM(l.amount) AS amount "
+    "FROM ledger_entry l JOIN \"transaction\" t ON t.id = l.transaction_id "
+    "WHERE t.transaction_type = 'DEPOSIT' "
+    "GROUP BY l.wallet_id"
+)
+
+
+def _apply(sign: str) -> None:
+    # ledger_entry may not exist yet on a fresh database (see 2c8b7e4d5a16).
+    op.execute(
+        "DO $$ BEGIN "
+        "IF to_regclass('ledger_entry') IS NOT NULL THEN "
+        f"UPDATE wallet SET balance = wallet.balance {sign} credited.amount "
+        f"FROM ({DEPOSIT_CREDITS}) AS credited "
+        "WHERE wallet.id = credited.wallet_id; "
+        "END IF; "
+        "END $$"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _apply("+")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _apply("-")
@@ -0,0 +1,54 @@
+"""use jsonb for json columns
+
+Revision ID: e7a3c5f09d12
+Revises: 9d4f1a6e2b83
+Create Date: 2026-10-15 12:03:18.730552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c5f09d12'
+down_revision: Union[str, Sequence[str], None] = '9d4f1a6e2b83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("UPDATE \"transaction\" SET meta_data = '{}' WHERE meta_data IS NULL")
+    op.alter_column('transaction', 'meta_data',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(),
+               postgresql_using='meta_data::jsonb',
+               server_default='{}',
+               nullable=False)
+
+    op.execute("UPDATE apikey SET permissions = '[]' WHERE permissions IS NULL")
+    op.alter_column('apikey', 'permissions',
+               existing_type=sa.JSON(),
+               type_=postgresql.JSONB(),
+               postgresql_using='permissions::jsonb',
+               server_default='[]',
+               nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('apikey', 'permissions',
+               existing_type=postgresql.JSONB(),
+               type_=sa.JSON(),
+               postgresql_using='permissions::json',
+               server_default=None,
+               nullable=True)
+    op.alter_column('transaction', 'meta_data',
+               existing_type=postgresql.JSONB(),
+               type_=sa.JSON(),
+               postgresql_using='meta_data::json',
+               server_default=None,
+               nullable=True)
@@ -0,0 +1,40 @@
+"""store apikey hash as bytes
+
+Revision ID: f3a7c1e5b920
+Revises: d5f0a2c7e913
+Create Date: 2026-10-15 15:31:48.204561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a7c1e5b920'
+down_revision: Union[str, Sequence[str], None] = 'd5f0a2c7e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing hex digests decode to the same bytes, so issued keys keep working.
+    op.alter_column('apikey', 'key_hash',
+               existing_type=sqlmodel.sql.sqltypes.AutoString(),
+               type_=sa.LargeBinary(),
+               existing_nullable=False,
+               postgresql_using="decode(key_hash, 'hex')")
+    op.create_index(op.f('ix_apikey_key_hash'), 'apikey', ['key_hash'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_apikey_key_hash'), table_name='apikey')
+    op.alter_column('apikey', 'key_hash',
+               existing_type=sa.LargeBinary(),
+               type_=sqlmodel.sql.sqltypes.AutoString(),
+               existing_nullable=False,
+               postgresql_using="encode(key_hash, 'hex')")
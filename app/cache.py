@@ -0,0 +1,97 @@
+import hashlib
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+
+API_KEY_TTL_SECONDS = 60
+API_KEY_CACHE_MAX = 10_000
+RECIPIENT_TTL_SECONDS = 86400
+RECIPIENT_CACHE_MAX = 100_000
+
+async def cached_json(request: Request) -> Any:
+    """
+    Parses the request body once and keeps the result on the ASGI scope,
+    so any later consumer of the same request reuses it instead of re-parsing.
+    """
+    if "_cached_json" not in request.scope:
+        request.scope["_cached_json"] = orjson.loads(await request.body())
+    return request.scope["_cached_json"]
+
+@dataclass(frozen=True)
+class CachedAPIKey:
+    key_id: uuid.UUID
+    user_id: uuid.UUID
+    permissions: tuple[str, ...]
+    expires_at: datetime
+
+# Keyed by the key's SHA-256 digest, like the DB, so no plaintext keys sit in memory
+api_key_cache: dict[bytes, tuple[float, CachedAPIKey]] = {}
+
+def get_cached_api_key(key_hash: bytes) -> CachedAPIKey | None:
+    hit = api_key_cache.get(key_hash)
+    if hit is None:
+        return None
+    if time.monotonic() - hit[0] >= API_KEY_TTL_SECONDS:
+        api_key_cache.pop(key_hash, None)
+        return None
+    return hit[1]
+
+def cache_api_key(key_hash: bytes, entry: CachedAPIKey):
+    if len(api_key_cache) >= API_KEY_CACHE_MAX:
+        # dicts keep insertion order, so this drops the oldest entry
+        api_key_cache.pop(next(iter(api_key_cache)))
+    api_key_cache[key_hash] = (time.monotonic(), entry)
+
+def invalidate_api_key(key_id: uuid.UUID):
+    """
+    Drops a key from this process's cache once it is revoked or rolled over.
+    Other workers stop accepting it within API_KEY_TTL_SECONDS.
+    """
+    for key_hash, (_, entry) in list(api_key_cache.items()):
+        if entry.key_id == key_id:
+            api_key_cache.pop(key_hash, None)
+
+recipient_cache: dict[str, tuple[float, str]] = {}
+
+def _recipient_key(bank_code: str, account_number: str) -> str:
+    return f"{bank_code}:{account_number}"
+
+def get_cached_recipient(bank_code: str, account_number: str) -> str | None:
+    """
+    Returns a Paystack recipient_code already created for this bank account.
+    Paystack codes are stable per account, so repeat withdrawals can skip
+    the create-recipient call.
+    """
+    key = _recipient_key(bank_code, account_number)
+    hit = recipient_cache.get(key)
+    if hit is None:
+        return None
+    if time.monotonic() - hit[0] >= RECIPIENT_TTL_SECONDS:
+        recipient_cache.pop(key, None)
+        return None
+    return hit[1]
+
+def cache_recipient(bank_code: str, account_number: str, recipient_code: str):
+    if len(recipient_cache) >= RECIPIENT_CACHE_MAX:
+        recipient_cache.pop(next(iter(recipient_cache)))
+    recipient_cache[_recipient_key(bank_code, account_number)] = (time.monotonic(), recipient_code)
+
+def cached_json_response(request: Request, payload: Any, cache_control: str = "private, max-age=30") -> Response:
+    """
+    Serializes the payload and tags it with a weak ETag.
+    Returns 304 Not Modified when the client already holds the same body.
+    """
+    body = orjson.dumps(payload)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -11,6 +11,14 @@ class Settings(BaseSettings):
     GOOGLE_REDIRECT_URI: str = "http://localhost:8000/auth/google/callback"
     PAYSTACK_SECRET_KEY: str
     BASE_URL: str = "http://localhost:8000"
+    PAYSTACK_MAX_CONCURRENCY: int = 20
+
+    DB_POOL_SIZE: int = 25
+    DB_MAX_OVERFLOW: int = 25
+    DB_POOL_TIMEOUT: int = 10
+
+    # e.g. redis://localhost:6379/0 so every worker shares the same limits
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
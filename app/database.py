@@ -1,20 +1,53 @@
-from sqlmodel import create_engine, SQLModel, Session
+from typing import AsyncIterator
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.config import settings
 
 connection_string = str(settings.DATABASE_URL)
 if connection_string.startswith("postgres://"):
-    connection_string = connection_string.replace("postgres://", "postgresql://", 1)
+    connection_string = connection_string.replace("postgres://", "postgresql+asyncpg://", 1)
+elif connection_string.startswith("postgresql://"):
+    connection_string = connection_string.replace("postgresql://", "postgresql+asyncpg://", 1)
 
-engine = create_engine(
+engine = create_async_engine(
     connection_string,
     echo=False,
-    pool_pre_ping=True,
-    pool_recycle=1800
+    poolclass=AsyncAdaptedQueuePool,
+    pool_pre_ping=False,
+    pool_recycle=1800,
+    pool_reset_on_return="rollback",
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_use_lifo=True,
+    # JIT compilation costs more than it saves on our short OLTP queries;
+    # asyncpg applies this in the startup packet, so it adds no round-trip.
+    connect_args={"server_settings": {"jit": "off"}}
 )
 
-def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+async def create_db_and_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    async with async_session() as session:
+        yield session
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    For work that outlives the request's session, such as background tasks.
+    """
+    return async_session
+
+def dialect_insert(session: AsyncSession):
+    """
+    Returns the insert() construct for the session's database, which
+    (unlike the generic one) supports ON CONFLICT DO NOTHING.
+    """
+    return pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert #type: ignore
@@ -1,4 +1,21 @@
+from fastapi import Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
\ No newline at end of file
+from app.config import settings
+
+def rate_limit_key(request: Request) -> str:
+    """
+    Limits authenticated callers per user so they can't dodge limits by
+    changing IPs or share them behind a NAT; anonymous routes fall back to IP.
+    """
+    context = getattr(request.state, "auth_context", None)
+    if context is not None:
+        return f"user:{context.user.id}"
+    return get_remote_address(request)
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy="moving-window"
+)
\ No newline at end of file
@@ -1,12 +1,14 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from slowapi import _rate_limit_exceeded_handler
 from .limiter import limiter
 from slowapi.errors import RateLimitExceeded
 from app.database import create_db_and_tables
-from starlette.middleware.sessions import SessionMiddleware
+from app.middleware import OAuthSessionMiddleware
 from app.config import settings
 from app.routers import auth, keys, wallet, banks
+from app.services.paystack import paystack_client
 import logging
 
 
@@ -19,11 +21,12 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Startup: Creating database tables...")
-    create_db_and_tables()
+    await create_db_and_tables()
     yield
     print("Shutdown: cleaning up...")
+    await paystack_client.close()
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.include_router(auth.router)
 app.include_router(keys.router)
 app.include_router(wallet.router)
@@ -34,7 +37,7 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler) #type
 
 
 app.add_middleware(
-    SessionMiddleware,
+    OAuthSessionMiddleware,
     secret_key=settings.SECRET_KEY,
     https_only=False
 )
@@ -0,0 +1,21 @@
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+OAUTH_PATH_PREFIX = "/auth/google"
+
+class OAuthSessionMiddleware:
+    """
+    Pure ASGI wrapper around Starlette's SessionMiddleware.
+    Only the Google OAuth routes use request.session (for the state param),
+    so every other request skips cookie verification and signing.
+    """
+    def __init__(self, app: ASGIApp, secret_key: str, https_only: bool = False):
+        self.app = app
+        self.session_app = SessionMiddleware(app, secret_key=secret_key, https_only=https_only)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith(OAUTH_PATH_PREFIX):
+            await self.session_app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -1,5 +1,7 @@
 from .core import User, Wallet, Transaction, APIKey 
 
 from .ledger import LedgerEntry
+from .webhook import WebhookEvent
+from .recipient import PaystackRecipient
 
-__all__ = ["User", "Wallet", "Transaction", "LedgerEntry", "APIKey"]
\ No newline at end of file
+__all__ = ["User", "Wallet", "Transaction", "LedgerEntry", "APIKey", "WebhookEvent", "PaystackRecipient"]
\ No newline at end of file
@@ -1,10 +1,16 @@
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
 import uuid
 
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import Column, JSON, BigInteger
+from sqlalchemy import Column, JSON, BigInteger, Index, LargeBinary, TIMESTAMP, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.uuidv7 import uuid7
+
+# Binary JSON on Postgres; plain JSON elsewhere (SQLite in tests).
+JSONType = JSON().with_variant(JSONB(), "postgresql")
 
 class TransactionType(str, Enum):
     DEPOSIT = "deposit"
@@ -17,11 +23,17 @@ class TransactionStatus(str, Enum):
     FAILED = "failed"
 
 class User(SQLModel, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     email: str = Field(unique=True, index=True)
     full_name: str
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    )
 
     wallet: Optional["Wallet"] = Relationship(
         back_populates="user",
@@ -31,38 +43,65 @@ class User(SQLModel, table=True):
     pin_hash: Optional[str] = Field(default=None)
 
 class Wallet(SQLModel, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    wallet_number: str = Field(unique=True, index=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+    wallet_number: int = Field(sa_column=Column(BigInteger, unique=True, index=True, nullable=False))
     balance: int = Field(sa_column=Column(BigInteger), default=0)
     currency: str = Field(default="NGN")
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    )
+    updated_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    )
 
     user_id: uuid.UUID | None = Field(default=None, foreign_key="user.id", unique=True)
     user: User = Relationship(back_populates="wallet")
     transactions: List["Transaction"] = Relationship(back_populates="wallet")
 
 class Transaction(SQLModel, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    __table_args__ = (
+        Index("ix_txn_wallet_created", "wallet_id", text("created_at DESC")),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     amount: int = Field(sa_column=Column(BigInteger))
     transaction_type: TransactionType
     status: TransactionStatus = Field(default=TransactionStatus.PENDING)
     reference: str = Field(unique=True, index=True)
-    meta_data: Optional[Dict[str, Any]] = Field(default={}, sa_column=Column(JSON)) 
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    meta_data: Dict[str, Any] = Field(
+        default_factory=dict,
+        sa_column=Column(JSONType, nullable=False, server_default="{}")
+    )
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    )
     
     wallet_id: uuid.UUID = Field(foreign_key="wallet.id")
     wallet: Wallet = Relationship(back_populates="transactions")
 
 class APIKey(SQLModel, table=True):
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    __table_args__ = (
+        Index("ix_apikey_user_active", "user_id", "is_active"),
+        Index("ix_apikey_user_expires", "user_id", "expires_at"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     name: str
-    key_hash: str
-    permissions: List[str] = Field(sa_column=Column(JSON), default=[])
+    key_hash: bytes = Field(sa_column=Column(LargeBinary, unique=True, index=True, nullable=False))
+    permissions: List[str] = Field(
+        default_factory=list,
+        sa_column=Column(JSONType, nullable=False, server_default="[]")
+    )
     
     is_active: bool = Field(default=True)
-    expires_at: datetime
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: datetime = Field(sa_column=Column(TIMESTAMP(timezone=True), nullable=False))
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    )
 
     user_id: uuid.UUID = Field(foreign_key="user.id")
     user: User = Relationship(back_populates="api_keys")
\ No newline at end of file
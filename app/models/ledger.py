@@ -1,12 +1,19 @@
+from typing import Optional
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, TIMESTAMP, func
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime
+
+from app.uuidv7 import uuid7
 
 class LedgerEntry(SQLModel, table=True):
     __tablename__ = "ledger_entry" #type: ignore
 
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
     wallet_id: uuid.UUID = Field(foreign_key="wallet.id", index=True)
     amount: int
     transaction_id: uuid.UUID = Field(foreign_key="transaction.id")
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
\ No newline at end of file
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    )
\ No newline at end of file
@@ -0,0 +1,22 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, TIMESTAMP, UniqueConstraint, func
+import uuid
+from datetime import datetime
+
+from app.uuidv7 import uuid7
+
+class PaystackRecipient(SQLModel, table=True):
+    __tablename__ = "paystack_recipient" #type: ignore
+    __table_args__ = (
+        UniqueConstraint("account_number", "bank_code", name="ux_paystack_recipient_account"),
+    )
+
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+    account_number: str
+    bank_code: str
+    recipient_code: str
+    created_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    )
@@ -0,0 +1,17 @@
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, TIMESTAMP, func
+import uuid
+from datetime import datetime
+
+from app.uuidv7 import uuid7
+
+class WebhookEvent(SQLModel, table=True):
+    __tablename__ = "webhook_event" #type: ignore
+
+    id: uuid.UUID = Field(default_factory=uuid7, primary_key=True)
+    paystack_event_id: str = Field(unique=True, index=True)
+    processed_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    )
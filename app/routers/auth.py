@@ -1,19 +1,20 @@
-from fastapi import APIRouter, Depends, Request, HTTPException
+from fastapi import APIRouter, Depends, Request, HTTPException, Response
 from authlib.integrations.starlette_client import OAuth
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
 from app.config import settings
 from app.services.user_service import get_or_create_user
-from app.security import create_access_token, get_current_user, get_pin_hash
+from app.security import create_access_token, get_current_user, aget_pin_hash
 from app.schemas import PINCreate
 from app.models.core import User
 from app.limiter import limiter
+from app.utils import format_wallet_number
 
 router = APIRouter()
 
 oauth = OAuth()
-oauth.register(
+google = oauth.register(
     name='google',
     client_id=settings.GOOGLE_CLIENT_ID,
     client_secret=settings.GOOGLE_CLIENT_SECRET,
@@ -28,18 +29,18 @@ async def login_google(request: Request):
     Copy this URL and paste it in a new tab (same browser) to login.
     """
     redirect_uri = settings.GOOGLE_REDIRECT_URI
-    response = await oauth.create_client('google').authorize_redirect(request, redirect_uri) #type: ignore
+    response = await google.authorize_redirect(request, redirect_uri) #type: ignore
     
     return {"url": response.headers["location"]}
 
 @router.get("/auth/google/callback")
-async def auth_google(request: Request, session: Session = Depends(get_session)):
+async def auth_google(request: Request, session: AsyncSession = Depends(get_session)):
     """
     Handles the callback from Google.
     Exchanges the code for a token, gets user info, and logs them in.
     """
     try:
-        token = await oauth.create_client('google').authorize_access_token(request) #type: ignore
+        token = await google.authorize_access_token(request) #type: ignore
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Google Auth failed: {str(e)}")
 
@@ -51,7 +52,7 @@ async def auth_google(request: Request, session: Session = Depends(get_session))
     email = user_info.get('email')
     name = user_info.get('name')
 
-    user = get_or_create_user(session, email, name)
+    user = await get_or_create_user(session, email, name)
 
     access_token = create_access_token(subject=user.id)
 
@@ -60,29 +61,25 @@ async def auth_google(request: Request, session: Session = Depends(get_session))
         "token_type": "bearer",
         "user": {
             "email": user.email,
-            "wallet_number": user.wallet.wallet_number if user.wallet else None
+            "wallet_number": format_wallet_number(user.wallet.wallet_number) if user.wallet else None
         }
     }
 
-@router.post("/auth/set-pin")
+@router.post("/auth/set-pin", status_code=204)
 @limiter.limit("5/hour")
-def set_pin(
+async def set_pin(
     request: Request,
     pin_data: PINCreate,
     user: User = Depends(get_current_user),
-    session: Session = Depends(get_session) 
-):
+    session: AsyncSession = Depends(get_session) 
+) -> Response:
     if user.pin_hash is not None:
         raise HTTPException(status_code=400, detail="PIN already set. Use change-pin endpoint")
     
-    hashed_pin = get_pin_hash(pin_data.pin)
+    hashed_pin = await aget_pin_hash(pin_data.pin)
     user.pin_hash = hashed_pin
 
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    await session.commit()
 
-    return {
-        "status": "success",
-        "message": "Transaction PIN secured."
-    }
\ No newline at end of file
+    return Response(status_code=204)
\ No newline at end of file
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from app.services.paystack import PaystackService
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from app.services.paystack import PaystackService, get_paystack
+from app.cache import cached_json_response
 from app.security import get_current_user
 from app.models.core import User
 
@@ -7,30 +8,33 @@ router = APIRouter(tags=["Banks"])
 
 
 @router.get("/banks")
-async def list_banks():
+async def list_banks(request: Request, paystack: PaystackService = Depends(get_paystack)):
     """
     Helpe endpoint to list banks and their codes
     """
-    # service = PaystackService()
-    banks = await PaystackService().get_banks()
+    banks = await paystack.get_banks()
+
+    # An empty list means Paystack failed; don't let clients or proxies cache it
+    if not banks:
+        raise HTTPException(status_code=502, detail="Bank list unavailable", headers={"Cache-Control": "no-store"})
 
     list = [
         {"name": bank["name"], "code": bank["code"]}
         for bank in banks
     ]
-    return list
+    return cached_json_response(request, list, cache_control="public, max-age=3600")
 
 @router.get("/banks/resolve")
 async def resolve_account_details(
     account_number: str = Query(..., min_length=10, max_length=10, description="NUBAN Account Number"),
     bank_code: str = Query(..., description="Bank code gotten from the bank list endpoint"),
-    user: User = Depends(get_current_user)
+    user: User = Depends(get_current_user),
+    paystack: PaystackService = Depends(get_paystack)
 ):
     """
     Verifies an account number and returns the account name
     """
-    service = PaystackService()
-    account_data = await service.resolve_account(account_number, bank_code)
+    account_data = await paystack.resolve_account(account_number, bank_code)
 
     if not account_data:
         raise HTTPException(status_code=404, detail="Could not resolve account, check number and bank")
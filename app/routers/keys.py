@@ -1,31 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlmodel import select, update, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.database import get_session
 from app.models.core import User, APIKey
-from app.schemas import APIKeyCreate
 from app.security import get_current_user
 from app.utils import generate_api_key, hash_api_key, calculate_expiry
 from app.schemas import APIKeyRollover, APIKeyCreate, APIKeyRevoke
 from app.limiter import limiter
+from app.cache import cached_json_response, invalidate_api_key
 from typing import List
 
 router = APIRouter()
 
 @router.post("/keys/create")
 @limiter.limit("10/day")
-def create_api_key(
+async def create_api_key(
     request: Request,
     request_data: APIKeyCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user)
 ):
     """
     Generates a new API Key for the authenticated user.
     Enforces a maximum of 5 active keys.
     """
-    active_keys = [key for key in user.api_keys if key.is_active]
+    statement = (
+        select(func.count())
+        .select_from(APIKey)
+        .where(APIKey.user_id == user.id, APIKey.is_active == True)
+    )
+    active_count = (await session.exec(statement)).one()
     
-    if len(active_keys) >= 5:
+    if active_count >= 5:
         raise HTTPException(
             status_code=400, 
             detail="Limit reached. You cannot have more than 5 active API keys."
@@ -49,8 +55,7 @@ def create_api_key(
     )
 
     session.add(new_key)
-    session.commit()
-    session.refresh(new_key)
+    await session.commit()
 
     return {
         "api_key": raw_key,
@@ -60,25 +65,30 @@ def create_api_key(
     }
 
 @router.post("/keys/rollover")
-def rollover_api_key(
+async def rollover_api_key(
     request: APIKeyRollover,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user)
 ):
     """
     Replaces an old/expired key with a new one inheriting the same permissions.
     """
-    statement = select(APIKey).where(APIKey.id == request.expired_key_id)
-    old_key = session.exec(statement).first()
-
-    if not old_key or old_key.user_id != user.id:
-        raise HTTPException(status_code=404, detail="API Key not found")
-
     try:
         expires_at = calculate_expiry(request.expiry)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    statement = (
+        update(APIKey)
+        .where(APIKey.id == request.expired_key_id, APIKey.user_id == user.id)
+        .values(is_active=False)
+        .returning(APIKey.name, APIKey.permissions)
+    )
+    old_key = (await session.exec(statement)).first()
+
+    if not old_key:
+        raise HTTPException(status_code=404, detail="API Key not found")
+
     raw_key = generate_api_key()
     hashed_key = hash_api_key(raw_key)
 
@@ -91,12 +101,9 @@ def rollover_api_key(
         is_active=True
     )
 
-    old_key.is_active = False
-
     session.add(new_key)
-    session.add(old_key)
-    session.commit()
-    session.refresh(new_key)
+    await session.commit()
+    invalidate_api_key(request.expired_key_id)
 
     return {
         "message": "Key rolled over successfully",
@@ -107,14 +114,18 @@ def rollover_api_key(
     }
 
 @router.get("/keys", response_model=List[dict])
-def list_api_keys(
-    session: Session = Depends(get_session),
+async def list_api_keys(
+    request: Request,
+    session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user)
 ):
     """
     List all API keys owned by the user.
     """
-    return [
+    statement = select(APIKey).where(APIKey.user_id == user.id)
+    user_keys = (await session.exec(statement)).all()
+
+    payload = [
         {
             "id": key.id,
             "name": key.name,
@@ -122,32 +133,43 @@ def list_api_keys(
             "is_active": key.is_active,
             "expires_at": key.expires_at
         }
-        for key in user.api_keys
+        for key in user_keys
     ]
+    return cached_json_response(request, payload)
 
-@router.post("/keys/revoke")
-def revoke_api_key(
+@router.post("/keys/revoke", status_code=204)
+async def revoke_api_key(
     request: APIKeyRevoke,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     user: User = Depends(get_current_user)
-):
+) -> Response:
     """
     Permanently deactivates a specific API Key.
     The key will no longer work for any request.
+    Revoking an already inactive key is a no-op.
     """
-    statement = select(APIKey).where(APIKey.id == request.key_id)
-    key_record = session.exec(statement).first()
-
-    if not key_record or key_record.user_id != user.id:
-        raise HTTPException(status_code=404, detail="API Key not found")
+    statement = (
+        update(APIKey)
+        .where(
+            APIKey.id == request.key_id,
+            APIKey.user_id == user.id,
+            APIKey.is_active == True
+        )
+        .values(is_active=False)
+        .returning(APIKey.id)
+    )
+    revoked = (await session.exec(statement)).first()
 
-    if not key_record.is_active:
-        return {"status": "ignored", "message": "Key is already inactive"}
+    if not revoked:
+        exists_stmt = select(APIKey.id).where(
+            APIKey.id == request.key_id,
+            APIKey.user_id == user.id
+        )
+        if not (await session.exec(exists_stmt)).first():
+            raise HTTPException(status_code=404, detail="API Key not found")
+        return Response(status_code=204)
 
-    key_record.is_active = False
-    session.add(key_record)
-    session.commit()
+    await session.commit()
+    invalidate_api_key(request.key_id)
 
-    return {
-        "message": f"API Key '{key_record.name}' has been revoked successfully."
-    }
\ No newline at end of file
+    return Response(status_code=204)
\ No newline at end of file
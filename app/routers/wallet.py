@@ -1,16 +1,23 @@
+import asyncio
 import hmac
-import hashlib
 import uuid
-import json
-from fastapi import APIRouter, Depends, HTTPException, Request, Header, Query
-from sqlmodel import Session, select, desc
-
-from app.database import get_session
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Header, Query
+from sqlalchemy import bindparam
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlmodel import select, insert, update, desc
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import dialect_insert, get_session, get_session_factory
 from app.models.core import User, Wallet, Transaction, TransactionType, TransactionStatus
-from app.models.ledger import LedgerEntry
-from app.security import require_permission, verify_pin
-from app.services.paystack import PaystackService
+from app.models.webhook import WebhookEvent
+from app.models.recipient import PaystackRecipient
+from app.security import require_permission, averify_pin
+from app.services.paystack import PaystackService, get_paystack
 from app.config import settings
+from app.uuidv7 import uuid7
+from app.cache import cached_json, get_cached_recipient, cache_recipient
+from app.utils import format_wallet_number
 from app.schemas import DepositRequest, TransferRequest, WithdrawalRequest
 import logging
 from app.limiter import limiter
@@ -19,13 +26,64 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/wallet", tags=["Wallet"])
 
+_PAYSTACK_KEY = settings.PAYSTACK_SECRET_KEY.encode()
+
+# Hot statements are built once at import and bound per request, so the
+# expression tree isn't rebuilt on every call and the compiled SQL cache hits.
+_TXN_BY_REF = select(Transaction).where(Transaction.reference == bindparam("ref"))
+
+_LOCK_TXN_AND_WALLET_BY_REF = (
+    select(Transaction, Wallet)
+    .join(Wallet, Wallet.id == Transaction.wallet_id) #type: ignore
+    .where(Transaction.reference == bindparam("ref"))
+    .with_for_update(of=[Transaction, Wallet]) #type: ignore
+)
+
+_RECIPIENT_CODE_BY_ACCOUNT = select(PaystackRecipient.recipient_code).where(
+    PaystackRecipient.account_number == bindparam("account"),
+    PaystackRecipient.bank_code == bindparam("bank")
+)
+
+_WALLET_ID_BY_NUMBER = select(Wallet.id).where(Wallet.wallet_number == bindparam("number"))
+
+# Ordered by id so two opposing transfers between the same pair always
+# take the locks in the same sequence and cannot deadlock.
+_LOCK_WALLETS_BY_ID = (
+    select(Wallet)
+    .where(Wallet.id.in_(bindparam("ids", expanding=True))) #type: ignore
+    .order_by(Wallet.id)
+    .with_for_update()
+    .execution_options(populate_existing=True)
+)
+
+async def store_deposit_metadata(
+    session_factory: async_sessionmaker[AsyncSession],
+    transaction_id: uuid.UUID,
+    paystack_data: dict
+):
+    """
+    Saves Paystack's initialization payload on the deposit after the response
+    has gone out. Runs on its own session since the request's is closed by then.
+    """
+    async with session_factory() as session:
+        statement = (
+            update(Transaction)
+            .where(Transaction.id == transaction_id) #type: ignore
+            .values(meta_data=paystack_data)
+        )
+        await session.exec(statement)
+        await session.commit()
+
 @router.post("/deposit")
 @limiter.limit("10/minute")
 async def initiate_deposit(
     request: Request,
     request_data: DepositRequest,
+    background_tasks: BackgroundTasks,
     user: User = Depends(require_permission("deposit")),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+    paystack: PaystackService = Depends(get_paystack)
 ):
     """
     Initiates a deposit via Paystack.
@@ -33,47 +91,66 @@ async def initiate_deposit(
     if request_data.amount <= 0:
         raise HTTPException(status_code=400, detail="Amount must be positive")
 
-    reference = str(uuid.uuid4())
-
-    paystack = PaystackService()
-
-    try:
-        paystack_data = await paystack.initialize_transaction(
-            email=user.email,
-            amount=request_data.amount,
-            reference=reference
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Payment initialization failed: {str(e)}")
-
     if not user.wallet:
         raise HTTPException(status_code=400, detail="User does not have a wallet linked")
 
+    reference = str(uuid7())
+
     new_txn = Transaction(
         amount=request_data.amount,
         transaction_type=TransactionType.DEPOSIT,
         status=TransactionStatus.PENDING,
         reference=reference,
-        wallet_id=user.wallet.id,
-        meta_data=paystack_data
+        wallet_id=user.wallet.id
     )
-    
     session.add(new_txn)
-    session.commit()
-    session.refresh(new_txn)
+
+    # The PENDING row and the Paystack call don't depend on each other, so
+    # run them together; both finish before the client can reach checkout.
+    paystack_result, commit_result = await asyncio.gather(
+        paystack.initialize_transaction(
+            email=user.email,
+            amount=request_data.amount,
+            reference=reference
+        ),
+        session.commit(),
+        return_exceptions=True
+    )
+
+    if isinstance(commit_result, Exception):
+        raise HTTPException(status_code=500, detail="Could not record deposit")
+
+    if isinstance(paystack_result, Exception):
+        new_txn.status = TransactionStatus.FAILED
+        session.add(new_txn)
+        await session.commit()
+        raise HTTPException(status_code=500, detail=f"Payment initialization failed: {str(paystack_result)}")
+
+    paystack_data = paystack_result
+    background_tasks.add_task(store_deposit_metadata, session_factory, new_txn.id, paystack_data)
 
     return {
         "authorization_url": paystack_data["authorization_url"],
-        "reference": reference,
-        # "data" : paystack_data
+        "reference": reference
     }
 
 
+def claim_webhook_event(session: AsyncSession, event_id: str):
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING id for a webhook event.
+    """
+    return (
+        dialect_insert(session)(WebhookEvent)
+        .values(id=uuid7(), paystack_event_id=event_id)
+        .on_conflict_do_nothing(index_elements=["paystack_event_id"])
+        .returning(WebhookEvent.id)
+    )
+
 @router.post("/paystack/webhook")
 async def paystack_webhook(
     request: Request,
     x_paystack_signature: str = Header(None),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Handles updates from Paystack. Verified via HMAC signature.
@@ -83,19 +160,19 @@ async def paystack_webhook(
     
     payload_bytes = await request.body()
     
-    expected_signature = hmac.new(
-        key=settings.PAYSTACK_SECRET_KEY.encode(),
-        msg=payload_bytes,
-        digestmod=hashlib.sha512
-    ).hexdigest()
+    try:
+        signature = bytes.fromhex(x_paystack_signature)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid signature")
 
+    expected_signature = hmac.digest(_PAYSTACK_KEY, payload_bytes, "sha512")
 
-    if not hmac.compare_digest(expected_signature, x_paystack_signature):
+    if not hmac.compare_digest(expected_signature, signature):
         raise HTTPException(status_code=400, detail="Invalid signature")
 
     try:
-        event_data = json.loads(payload_bytes)
-    except json.JSONDecodeError:
+        event_data = await cached_json(request)
+    except orjson.JSONDecodeError:
         raise HTTPException(status_code=400, detail="Invalid JSON")
 
     event_type = event_data.get("event")
@@ -106,51 +183,45 @@ async def paystack_webhook(
     data = event_data.get("data", {})
     reference = data.get("reference")
     amount_paid = data.get("amount") 
-    statement = select(Transaction).where(Transaction.reference == reference)
-    transaction = session.exec(statement).first()
+    event_id = str(data.get("id") or reference)
+    try:
+        # Claim the event first: a concurrent duplicate blocks on the unique
+        # index until this transaction ends, then inserts nothing. The claim
+        # rolls back with the credit, so a failed attempt can be redelivered.
+        claimed = (await session.exec(claim_webhook_event(session, event_id))).first() #type: ignore
+        if claimed is None:
+            return {"status": "ignored", "message": "Event already processed"}
 
-    if not transaction:
-        return {"status": "error", "message": "Transaction not found"}
+        row = (await session.exec(_LOCK_TXN_AND_WALLET_BY_REF, params={"ref": reference})).first()
 
-    if transaction.status == TransactionStatus.SUCCESS:
-        return {"status": "ignored", "message": "Transaction already processed"}
+        if not row:
+            return {"status": "error", "message": "Transaction not found"}
 
-    try:
-        wallet_stmt = (
-            select(Wallet)
-            .where(Wallet.id == transaction.wallet_id)
-            .with_for_update()
-        )
-        wallet = session.exec(wallet_stmt).first()
+        transaction, wallet = row
 
-        if not wallet:
-            return {"status": "error", "message": "Wallet not found"}
+        if transaction.status == TransactionStatus.SUCCESS:
+            return {"status": "ignored", "message": "Transaction already processed"}
 
-        entry = LedgerEntry(
-            wallet_id=wallet.id,
-            amount = amount_paid,
-            transaction_id=transaction.id
-        )
-        session.add(entry)
+        LedgerService().record_entry(session, wallet, amount_paid, transaction.id)
 
         transaction.status = TransactionStatus.SUCCESS
         session.add(transaction)
 
-        session.commit()
+        await session.commit()
         
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         return {"status": "error", "message": "Internal server error"}
 
     return {"status": "success"}
 
 @router.post("/transfer")
 @limiter.limit("20/minute")
-def transfer_funds(
+async def transfer_funds(
     request: Request,
     request_data: TransferRequest,
     user: User = Depends(require_permission("transfer")),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Internal wallet-to-wallet transfer.
@@ -158,7 +229,7 @@ def transfer_funds(
     if user.pin_hash is None:
         raise HTTPException(status_code=400, detail="Transaction PIN not set")
     
-    pin = verify_pin(request_data.pin, user.pin_hash)
+    pin = await averify_pin(request_data.pin, user.pin_hash)
     if not pin:
         raise HTTPException(status_code=400, detail="Invalid Transaction PIN.")
     
@@ -169,72 +240,62 @@ def transfer_funds(
     if not sender_wallet:
         raise HTTPException(status_code=400, detail="You do not have a wallet")
     
-    ledger_service = LedgerService()
-    current_balance = ledger_service.get_current_balance(session, sender_wallet.id)
+    params = {"number": int(request_data.wallet_number)}
+    receiver_id = (await session.exec(_WALLET_ID_BY_NUMBER, params=params)).first()
 
-    if current_balance < request_data.amount:
-        raise HTTPException(status_code=400, detail="Insufficient funds")
-
-    statement = select(Wallet).where(Wallet.wallet_number == request_data.wallet_number)
-    receiver_wallet = session.exec(statement).first()
-
-    if not receiver_wallet:
+    if not receiver_id:
         raise HTTPException(status_code=404, detail="Recipient wallet not found")
 
-    if sender_wallet.id == receiver_wallet.id:
+    if sender_wallet.id == receiver_id:
         raise HTTPException(status_code=400, detail="Cannot transfer to yourself")
 
-    reference = str(uuid.uuid4())
-
-    sender_wallet.balance -= request_data.amount
-    receiver_wallet.balance += request_data.amount
-
-    sender_txn = Transaction(
-        amount=-request_data.amount,
-        transaction_type=TransactionType.TRANSFER,
-        status=TransactionStatus.SUCCESS,
-        reference=reference,
-        wallet_id=sender_wallet.id,
-        meta_data={"direction": "sent", "recipient": receiver_wallet.wallet_number}
-    )
-
-    receiver_txn = Transaction(
-        amount=request_data.amount,
-        transaction_type=TransactionType.TRANSFER,
-        status=TransactionStatus.SUCCESS,
-        reference=f"{reference}-credit",
-        wallet_id=receiver_wallet.id,
-        meta_data={"direction": "received", "sender": sender_wallet.wallet_number}
-    )
-
-    session.add(sender_txn)
-    session.add(receiver_txn)
-    session.flush()
-    
-    sender_entry = LedgerEntry(
-        wallet_id = sender_wallet.id,
-        amount = -request_data.amount,
-        transaction_id = sender_txn.id
-    )
+    params = {"ids": [sender_wallet.id, receiver_id]}
+    wallets = {wallet.id: wallet for wallet in (await session.exec(_LOCK_WALLETS_BY_ID, params=params)).all()}
+    sender_wallet, receiver_wallet = wallets[sender_wallet.id], wallets[receiver_id]
 
-    receiver_entry = LedgerEntry(
-        wallet_id = receiver_wallet.id,
-        amount = request_data.amount,
-        transaction_id = receiver_txn.id
-    )
+    if sender_wallet.balance < request_data.amount:
+        raise HTTPException(status_code=400, detail="Insufficient funds")
 
-    session.add(sender_entry)
-    session.add(receiver_entry)
-    session.commit()
+    reference = str(uuid7())
+
+    sender_txn_id, receiver_txn_id = uuid7(), uuid7()
+
+    statement = insert(Transaction).values([
+        {
+            "id": sender_txn_id,
+            "amount": -request_data.amount,
+            "transaction_type": TransactionType.TRANSFER,
+            "status": TransactionStatus.SUCCESS,
+            "reference": reference,
+            "wallet_id": sender_wallet.id,
+            "meta_data": {"direction": "sent", "recipient": format_wallet_number(receiver_wallet.wallet_number)}
+        },
+        {
+            "id": receiver_txn_id,
+            "amount": request_data.amount,
+            "transaction_type": TransactionType.TRANSFER,
+            "status": TransactionStatus.SUCCESS,
+            "reference": f"{reference}-credit",
+            "wallet_id": receiver_wallet.id,
+            "meta_data": {"direction": "received", "sender": format_wallet_number(sender_wallet.wallet_number)}
+        },
+    ])
+    await session.exec(statement) #type: ignore
+
+    await LedgerService().record_entries(session, [
+        (sender_wallet, -request_data.amount, sender_txn_id),
+        (receiver_wallet, request_data.amount, receiver_txn_id),
+    ])
+    await session.commit()
     
     return {"status": "success", "message": "Transfer successful", "reference": reference}
 
 @router.get("/balance")
 @limiter.limit("100/minute")
-def get_balance(
+async def get_balance(
     request: Request,
     user: User = Depends(require_permission("read")),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """
     Returns the current wallet balance.
@@ -247,7 +308,7 @@ def get_balance(
     
     ledger_service = LedgerService()
 
-    balance = ledger_service.get_current_balance(
+    balance = await ledger_service.get_current_balance(
         session=session,
         wallet_id=user.wallet.id
     )
@@ -259,36 +320,50 @@ def get_balance(
 
 @router.get("/transactions")
 @limiter.limit("50/minute")
-def get_transactions(
+async def get_transactions(
     request: Request,
     user: User = Depends(require_permission("read")),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     skip: int = Query(default=0, ge=0, description="Number of records to skip"),
-    limit: int = Query(default=20, ge=1, le=100, description="Max records to return")
+    limit: int = Query(default=20, ge=1, le=100, description="Max records to return"),
+    include_meta: bool = Query(default=False, description="Include each transaction's meta_data")
 ):
     """
     Returns the list of all transactions for the user's wallet.
+    Selects plain columns rather than ORM objects; meta_data is opt-in.
     """
     if not user.wallet:
         raise HTTPException(status_code=404, detail="No wallet found")
 
+    columns = [
+        Transaction.id,
+        Transaction.amount,
+        Transaction.transaction_type,
+        Transaction.status,
+        Transaction.reference,
+        Transaction.created_at,
+    ]
+    if include_meta:
+        columns.append(Transaction.meta_data)
+
     statement = (
-        select(Transaction)
+        select(*columns)
         .where(Transaction.wallet_id == user.wallet.id)
         .order_by(desc(Transaction.created_at))
         .offset(skip)
         .limit(limit)
     )
-    transactions = session.exec(statement).all()
+    rows = (await session.exec(statement)).all()
     
-    return transactions
+    return [row._asdict() for row in rows]
 
 
 @router.get("/deposit/{reference}/status")
 async def get_deposit_status(
     reference: str,
     user: User = Depends(require_permission("read")),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    paystack: PaystackService = Depends(get_paystack)
 ):
     """
     Checks the status of a specific deposit.
@@ -297,8 +372,7 @@ async def get_deposit_status(
     - If Paystack says "failed/reversed", we update DB to FAILED (allowed).
     - If Paystack says "success", we DO NOT update DB/credit wallet (strictly compliant).
     """
-    statement = select(Transaction).where(Transaction.reference == reference)
-    txn = session.exec(statement).first()
+    txn = (await session.exec(_TXN_BY_REF, params={"ref": reference})).first()
 
     if not txn:
         raise HTTPException(status_code=404, detail="Transaction not found")
@@ -307,8 +381,6 @@ async def get_deposit_status(
         raise HTTPException(status_code=403, detail="Not authorized to view this transaction")
 
     if txn.status == TransactionStatus.PENDING:
-        paystack = PaystackService()
-
         try:
             verification_data = await paystack.verify_transaction(reference)
             gateway_status = verification_data.get("status") 
@@ -316,8 +388,7 @@ async def get_deposit_status(
             if gateway_status in ["failed", "reversed", "abandoned"]:
                 txn.status = TransactionStatus.FAILED
                 session.add(txn)
-                session.commit()
-                session.refresh(txn)
+                await session.commit()
             
             elif gateway_status == "success":
                  return {
@@ -340,14 +411,20 @@ async def get_deposit_status(
 async def withdraw_funds(
     request: WithdrawalRequest,
     user: User = Depends(require_permission("transfer")),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    paystack: PaystackService = Depends(get_paystack)
 ):
     if not user.pin_hash:
         raise HTTPException(400, "PIN not set")
-    if not verify_pin(request.pin, user.pin_hash):
+    if not await averify_pin(request.pin, user.pin_hash):
         raise HTTPException(401, "Invalid PIN")
 
-    wallet = user.wallet
+    if not user.wallet:
+        raise HTTPException(status_code=400, detail="User does not have a linked wallet")
+
+    # Lock the wallet (it's already in the identity map from auth) so the
+    # debit can't race a concurrent transfer or withdrawal.
+    wallet = await session.get(Wallet, user.wallet.id, with_for_update=True, populate_existing=True)
     if not wallet:
         raise HTTPException(status_code=400, detail="User does not have a linked wallet")
     if wallet.balance < request.amount:
@@ -356,24 +433,43 @@ async def withdraw_funds(
     original_balance = wallet.balance
     wallet.balance -= request.amount
     session.add(wallet)
-    session.commit()
-    session.refresh(wallet)
+    await session.commit()
+
+    recipient_code = get_cached_recipient(request.bank_code, request.account_number)
+    if not recipient_code:
+        params = {"account": request.account_number, "bank": request.bank_code}
+        recipient_code = (await session.exec(_RECIPIENT_CODE_BY_ACCOUNT, params=params)).first()
+        # End the read here so no transaction stays open across Paystack calls
+        await session.commit()
 
-    paystack = PaystackService()
-    
-    recipient_code = await paystack.create_transfer_recipient(
-        name=request.account_name,
-        account_number=request.account_number,
-        bank_code=request.bank_code
-    )
-    
     if not recipient_code:
-        wallet.balance += request.amount
-        session.add(wallet)
-        session.commit()
-        raise HTTPException(500, "Failed to register bank account with provider")
+        recipient_code = await paystack.create_transfer_recipient(
+            name=request.account_name,
+            account_number=request.account_number,
+            bank_code=request.bank_code
+        )
+    
+        if not recipient_code:
+            await LedgerService().adjust_balance(session, wallet, request.amount)
+            await session.commit()
+            raise HTTPException(500, "Failed to register bank account with provider")
+
+        statement = (
+            dialect_insert(session)(PaystackRecipient)
+            .values(
+                id=uuid7(),
+                account_number=request.account_number,
+                bank_code=request.bank_code,
+                recipient_code=recipient_code
+            )
+            .on_conflict_do_nothing(index_elements=["account_number", "bank_code"])
+        )
+        await session.exec(statement) #type: ignore
+        await session.commit()
+
+    cache_recipient(request.bank_code, request.account_number, recipient_code)
 
-    reference = f"wth-{uuid.uuid4()}"
+    reference = f"wth-{uuid7()}"
     transfer_result = await paystack.initiate_transfer(
         amount=request.amount,
         recipient_code=recipient_code,
@@ -382,9 +478,8 @@ async def withdraw_funds(
     )
 
     if not transfer_result["status"]:
-        wallet.balance += request.amount
-        session.add(wallet)
-        session.commit()
+        await LedgerService().adjust_balance(session, wallet, request.amount)
+        await session.commit()
         logger.error(f"Withdrawal failed for {user.email}: {transfer_result['message']}")
         raise HTTPException(502, "Transfer failed at provider")
 
@@ -397,6 +492,6 @@ async def withdraw_funds(
         meta_data={"bank": request.bank_code, "account": request.account_number}
     )
     session.add(txn)
-    session.commit()
+    await session.commit()
 
     return {"status": "success", "message": "Withdrawal processing", "reference": reference}
\ No newline at end of file
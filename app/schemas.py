@@ -8,7 +8,7 @@ class APIKeyCreate(BaseModel):
     expiry: str
 
 class TransferRequest(BaseModel):
-    wallet_number: str
+    wallet_number: str = Field(min_length=10, max_length=10, pattern=r"^\d{10}$")
     amount: int
     description: str = "Transfer"
     pin: str
@@ -1,22 +1,30 @@
+import asyncio
 from datetime import datetime, timedelta, timezone
 from typing import Any, Union, Optional, List
 from dataclasses import dataclass, field
 from jose import jwt, JWTError
 import uuid
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
 
-from fastapi import Depends, HTTPException, status, Security
+from fastapi import Depends, HTTPException, Request, status, Security
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyHeader
-from sqlmodel import Session, select
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
 from app.database import get_session
 from app.models.core import User, APIKey
 from app.utils import hash_api_key
+from app.cache import CachedAPIKey, get_cached_api_key, cache_api_key
 
 security_scheme = HTTPBearer(auto_error=False)
 api_key_header = APIKeyHeader(name="x-api-key", auto_error=False)
-password_hash = PasswordHash.recommended()
+# Argon2id tuned for short numeric PINs: lighter than the recommended
+# profile (64 MiB, t=3) so a PIN check doesn't pin a worker thread as long.
+# Hashes made with the old parameters still verify.
+password_hash = PasswordHash((Argon2Hasher(time_cost=2, memory_cost=32768),))
 
 @dataclass
 class UserAuthContext:
@@ -35,7 +43,7 @@ def create_access_token(subject: Union[str, Any], expires_delta: Union[timedelta
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def get_user_from_jwt(token: str, session: Session) -> Optional[User]:
+async def get_user_from_jwt(token: str, session: AsyncSession) -> Optional[User]:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         user_id: str | None = payload.get("sub")
@@ -44,51 +52,79 @@ def get_user_from_jwt(token: str, session: Session) -> Optional[User]:
     except JWTError:
         return None
     
-    return session.get(User, uuid.UUID(user_id))
+    statement = (
+        select(User)
+        .options(joinedload(User.wallet)) #type: ignore
+        .where(User.id == uuid.UUID(user_id))
+    )
+    return (await session.exec(statement)).first()
 
-def get_user_from_api_key(api_key: str, session: Session) -> Optional[APIKey]:
+async def get_user_from_api_key(api_key: str, session: AsyncSession) -> Optional[UserAuthContext]:
     """
-    Returns the APIKey record if valid, so we can access permissions.
+    Returns the key's owner and permissions if the key is valid.
+    Key lookups are cached briefly, so hot keys only need a user fetch.
     """
+    user = None
     hashed = hash_api_key(api_key)
-    statement = select(APIKey).where(APIKey.key_hash == hashed)
-    key_record = session.exec(statement).first()
-    
-    if not key_record or not key_record.is_active:
-        return None
+    cached = get_cached_api_key(hashed)
+
+    if cached is None:
+        statement = (
+            select(APIKey)
+            .options(joinedload(APIKey.user).joinedload(User.wallet)) #type: ignore
+            .where(APIKey.key_hash == hashed)
+        )
+        key_record = (await session.exec(statement)).first()
         
-    db_expiry = key_record.expires_at
-    if db_expiry.tzinfo is None:
-        db_expiry = db_expiry.replace(tzinfo=timezone.utc)
-
-    if db_expiry < datetime.now(timezone.utc):
+        if not key_record or not key_record.is_active:
+            return None
+            
+        db_expiry = key_record.expires_at
+        if db_expiry.tzinfo is None:
+            db_expiry = db_expiry.replace(tzinfo=timezone.utc)
+
+        cached = CachedAPIKey(
+            key_id=key_record.id,
+            user_id=key_record.user_id,
+            permissions=tuple(key_record.permissions),
+            expires_at=db_expiry
+        )
+        cache_api_key(hashed, cached)
+        user = key_record.user
+
+    if cached.expires_at < datetime.now(timezone.utc):
         return None
+
+    if user is None:
+        user = await session.get(User, cached.user_id, options=[joinedload(User.wallet)]) #type: ignore
+        if user is None:
+            return None
     
-    return key_record
+    return UserAuthContext(user=user, permissions=list(cached.permissions), is_admin=False)
 
 
-def get_auth_context(
+async def get_auth_context(
+    request: Request,
     auth_creds: Optional[HTTPAuthorizationCredentials] = Depends(security_scheme),
     api_key_str: Optional[str] = Security(api_key_header),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ) -> UserAuthContext:
     """
     Determines if the request is from a Human (JWT) or a Service (API Key).
     Returns a context object containing the User and their Permissions.
     """
     if auth_creds:
-        user = get_user_from_jwt(auth_creds.credentials, session)
+        user = await get_user_from_jwt(auth_creds.credentials, session)
         if user:
-            return UserAuthContext(user=user, is_admin=True, permissions=[])
+            context = UserAuthContext(user=user, is_admin=True, permissions=[])
+            request.state.auth_context = context
+            return context
 
     if api_key_str:
-        key_record = get_user_from_api_key(api_key_str, session)
-        if key_record:
-            return UserAuthContext(
-                user=key_record.user,
-                permissions=key_record.permissions, 
-                is_admin=False
-            )
+        context = await get_user_from_api_key(api_key_str, session)
+        if context:
+            request.state.auth_context = context
+            return context
 
     raise HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -123,4 +159,11 @@ def verify_pin(plain_pin, hashed_pin):
     return password_hash.verify(plain_pin, hashed_pin)
 
 def get_pin_hash(pin):
-    return password_hash.hash(pin)
\ No newline at end of file
+    return password_hash.hash(pin)
+
+## KDF work is CPU-bound; run it off the event loop
+async def averify_pin(plain_pin, hashed_pin):
+    return await asyncio.to_thread(password_hash.verify, plain_pin, hashed_pin)
+
+async def aget_pin_hash(pin):
+    return await asyncio.to_thread(password_hash.hash, pin)
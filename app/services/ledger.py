@@ -1,15 +1,70 @@
-from sqlmodel import Session, select, func
+from sqlalchemy import bindparam, insert, update
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.models.core import Wallet
 from app.models.ledger import LedgerEntry
+from app.uuidv7 import uuid7
 import uuid
 
+wallet_table = Wallet.__table__ #type: ignore
+
+_ADJUST_BALANCE = (
+    update(wallet_table)
+    .where(wallet_table.c.id == bindparam("wid"))
+    .values(balance=wallet_table.c.balance + bindparam("delta"))
+)
+
 class LedgerService:
-    def get_current_balance(self, session: Session, wallet_id: uuid.UUID) -> int:
+    def record_entry(self, session: AsyncSession, wallet: Wallet, amount: int, transaction_id: uuid.UUID) -> LedgerEntry:
+        """
+        Appends a ledger entry and applies it to the wallet's balance counter.
+        Both land in the caller's transaction, so the caller should hold a
+        row lock on the wallet and commit once.
+        """
+        entry = LedgerEntry(
+            wallet_id=wallet.id,
+            amount=amount,
+            transaction_id=transaction_id
+        )
+        wallet.balance += amount
+        session.add_all([entry, wallet])
+        return entry
+
+    async def record_entries(self, session: AsyncSession, entries: list[tuple[Wallet, int, uuid.UUID]]):
+        """
+        Bulk form of record_entry for (wallet, amount, transaction_id) tuples:
+        one multi-row INSERT for the ledger and one executemany UPDATE for the
+        balances, without unit-of-work tracking. Same locking rules apply.
+        """
+        await session.exec(insert(LedgerEntry).values([ #type: ignore
+            {"id": uuid7(), "wallet_id": wallet.id, "amount": amount, "transaction_id": transaction_id}
+            for wallet, amount, transaction_id in entries
+        ]))
+        await session.exec(_ADJUST_BALANCE, params=[ #type: ignore
+            {"wid": wallet.id, "delta": amount}
+            for wallet, amount, _ in entries
+        ])
+
+        # keep the loaded wallets in step without marking them dirty
+        for wallet, amount, _ in entries:
+            set_committed_value(wallet, "balance", wallet.balance + amount)
+
+    async def adjust_balance(self, session: AsyncSession, wallet: Wallet, amount: int):
         """
-        Calculates the live balance by summing all ledger entries.
-        Returns 0 if no entries exist.
+        Applies amount to the wallet's balance counter in one atomic UPDATE,
+        for callers that no longer hold the row lock (e.g. refunding a
+        withdrawal after the Paystack call). The caller commits.
+        """
+        await session.exec(_ADJUST_BALANCE, params={"wid": wallet.id, "delta": amount}) #type: ignore
+
+    async def get_current_balance(self, session: AsyncSession, wallet_id: uuid.UUID) -> int:
         """
-        statement = select(func.sum(LedgerEntry.amount)).where(LedgerEntry.wallet_id == wallet_id)
-        
-        result = session.exec(statement).one()
-        
-        return result if result is not None else 0
\ No newline at end of file
+        Returns the wallet's materialized balance, kept in step with the
+        ledger by record_entry.
+        """
+        statement = select(Wallet.balance).where(Wallet.id == wallet_id)
+
+        result = (await session.exec(statement)).first()
+
+        return result if result is not None else 0
@@ -1,40 +1,124 @@
+import asyncio
+import random
+import time
 import httpx
+import orjson
 from app.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_ATTEMPTS = 3
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_CAP_SECONDS = 2.0
+BANKS_TTL_SECONDS = 86400
 
 class PaystackService:
     def __init__(self):
-        self.secret_key = settings.PAYSTACK_SECRET_KEY
         self.base_url = "https://api.paystack.co"
-        self.headers = {
-            "Authorization": f"Bearer {self.secret_key}",
-            "Content-Type": "application/json"
-        }
+        # Long-lived so keep-alive connections to Paystack are reused
+        # instead of paying a TCP + TLS handshake on every call; HTTP/2 lets
+        # concurrent calls share one connection.
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={
+                "Authorization": f"Bearer {settings.PAYSTACK_SECRET_KEY}",
+                "Content-Type": "application/json"
+            },
+            http2=True,
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+        self._semaphore = asyncio.Semaphore(settings.PAYSTACK_MAX_CONCURRENCY)
+        self._banks_cache: tuple[float, list] | None = None
+        self._banks_lock = asyncio.Lock()
+
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a request with at most PAYSTACK_MAX_CONCURRENCY in flight,
+        retrying with jittered exponential backoff.
+        Everything is retried on 429 or when the connection never opened;
+        5xx and mid-request failures are only retried for GETs, since
+        Paystack may already have acted on a POST.
+        """
+        idempotent = method == "GET"
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                async with self._semaphore:
+                    response = await self._client.request(method, url, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout):
+                if attempt >= MAX_ATTEMPTS:
+                    raise
+            except httpx.TransportError:
+                if not idempotent or attempt >= MAX_ATTEMPTS:
+                    raise
+            else:
+                retryable = response.status_code == 429 or (idempotent and response.status_code in RETRY_STATUSES)
+                if not retryable or attempt >= MAX_ATTEMPTS:
+                    return response
+
+            delay = min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+            logger.warning(f"Paystack {method} {url} failed (attempt {attempt}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay + random.uniform(0, BACKOFF_BASE_SECONDS))
+
+    async def close(self):
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
 # ----------- external withdrawals------------------
+    def _fresh_banks(self) -> list | None:
+        if self._banks_cache and time.monotonic() - self._banks_cache[0] < BANKS_TTL_SECONDS:
+            return self._banks_cache[1]
+        return None
+
     async def get_banks(self):
+        """
+        Returns the list of supported banks, fetching it at most once per TTL.
+        Concurrent callers on a cold cache wait on the lock and share one fetch.
+        Empty results (Paystack errors) are not cached.
+        """
+        cached = self._fresh_banks()
+        if cached is not None:
+            return cached
+
+        async with self._banks_lock:
+            cached = self._fresh_banks()
+            if cached is not None:
+                return cached
+
+            data = await self._fetch_banks()
+            if data:
+                self._banks_cache = (time.monotonic(), data)
+            return data
+
+    async def _fetch_banks(self):
         """
         Fetching the list of supported banks by paystack
         """
-        url = f"{self.base_url}/bank"
+        url = "/bank"
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers)
+            response = await self._request("GET", url)
             if response.status_code != 200:
                 logger.error(f"Paystack bank list failed: {response.text}")
                 return []
             
-            data = response.json()
+            data = orjson.loads(response.content)
             return data.get("data", [])
         except Exception as e:
             logger.error(f"Error fetching banks: {str(e)}")
             return []
         
     async def resolve_account(self, account_number: str, bank_code: str):
-        url = f"{self.base_url}/bank/resolve"
+        url = "/bank/resolve"
         logger.info(f"Sending to Paystack -> Account: {account_number}, Bank: {bank_code}")
 
         params = {
@@ -43,15 +127,14 @@ class PaystackService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, params=params)
+            response = await self._request("GET", url, params=params)
 
             logger.info(f"Generated Paystack URL: {response.url}")
             
             if response.status_code != 200:
                 logger.error(f"Account resolution failed: {response.text}")
                 return None
-            return response.json()["data"]
+            return orjson.loads(response.content)["data"]
     
         except Exception as e:
             logger.error(f"Error resolving account: {str(e)}")
@@ -61,7 +144,7 @@ class PaystackService:
         """
         Register the beneficiary to get a Recipient Code (RCP_...).
         """
-        url = f"{self.base_url}/transferrecipient"
+        url = "/transferrecipient"
         
         data = {
             "type": "nuban",
@@ -72,21 +155,20 @@ class PaystackService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, headers=self.headers, json=data)
+            response = await self._request("POST", url, json=data)
             
             if response.status_code not in [200, 201]:
                 logger.error(f"Create Recipient Failed: {response.text}")
                 return None
             
-            return response.json()["data"]["recipient_code"]
+            return orjson.loads(response.content)["data"]["recipient_code"]
             
         except Exception as e:
             logger.error(f"Error creating recipient: {str(e)}")
             return None
 
     async def initiate_transfer(self, amount: int, recipient_code: str, reference: str, reason: str):
-        url = f"{self.base_url}/transfer"
+        url = "/transfer"
         
         amount_kobo = amount * 100 
         
@@ -99,14 +181,13 @@ class PaystackService:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(url, headers=self.headers, json=data)
+            response = await self._request("POST", url, json=data)
             
             if response.status_code not in [200, 201]:
                 logger.error(f"Transfer Failed: {response.text}")
                 return {"status": False, "message": response.text}
             
-            return {"status": True, "data": response.json()["data"]}
+            return {"status": True, "data": orjson.loads(response.content)["data"]}
             
         except Exception as e:
             logger.error(f"Error initiating transfer: {str(e)}")
@@ -117,7 +198,7 @@ class PaystackService:
         """
         Initialize a transaction with Paystack.
         """
-        url = f"{self.base_url}/transaction/initialize"
+        url = "/transaction/initialize"
         payload = {
             "email": email,
             "amount": amount,
@@ -125,28 +206,29 @@ class PaystackService:
             "callback_url": f"{settings.BASE_URL}/payment-success"
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(url, json=payload, headers=self.headers)
-                response.raise_for_status()
-                return response.json()["data"]
-            except httpx.HTTPStatusError as e:
-                print(f"Paystack Error: {e.response.text}")
-                raise ValueError("Payment initialization failed")
+        try:
+            response = await self._request("POST", url, json=payload)
+            response.raise_for_status()
+            return orjson.loads(response.content)["data"]
+        except httpx.HTTPStatusError as e:
+            print(f"Paystack Error: {e.response.text}")
+            raise ValueError("Payment initialization failed")
 
     async def verify_transaction(self, reference: str):
         """
         Verify the status of a transaction.
         """
-        url = f"{self.base_url}/transaction/verify/{reference}"
+        url = f"/transaction/verify/{reference}"
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
-                return response.json()["data"]
-            except httpx.HTTPStatusError as e:
-                print(f"Paystack Verification Error: {e.response.text}")
-                raise ValueError("Payment verification failed")
-
-# paystack_client = PaystackService()
\ No newline at end of file
+        try:
+            response = await self._request("GET", url)
+            response.raise_for_status()
+            return orjson.loads(response.content)["data"]
+        except httpx.HTTPStatusError as e:
+            print(f"Paystack Verification Error: {e.response.text}")
+            raise ValueError("Payment verification failed")
+
+paystack_client = PaystackService()
+
+def get_paystack() -> PaystackService:
+    return paystack_client
@@ -1,15 +1,19 @@
-from sqlmodel import Session, select
+from sqlalchemy.orm import joinedload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models.core import User, Wallet
 import secrets
-import string
 
-def get_or_create_user(session: Session, email: str, full_name: str) -> User:
+# Candidates checked per query; a whole batch colliding is vanishingly rare
+WALLET_NUMBER_BATCH = 16
+
+async def get_or_create_user(session: AsyncSession, email: str, full_name: str) -> User:
     """
     Finds a user by email or creates a new one with a linked wallet.
     Includes collision detection for wallet numbers.
     """
-    statement = select(User).where(User.email == email)
-    existing_user = session.exec(statement).first()
+    statement = select(User).options(joinedload(User.wallet)).where(User.email == email) #type: ignore
+    existing_user = (await session.exec(statement)).first()
     
     if existing_user:
         return existing_user
@@ -19,13 +23,15 @@ def get_or_create_user(session: Session, email: str, full_name: str) -> User:
     
     unique_wallet_number = None
     
-    while True:
-        candidate = ''.join(secrets.choice(string.digits) for _ in range(10))
+    while unique_wallet_number is None:
+        candidates = [
+            secrets.randbelow(10_000_000_000)
+            for _ in range(WALLET_NUMBER_BATCH)
+        ]
         
-        check_stmt = select(Wallet).where(Wallet.wallet_number == candidate)
-        if not session.exec(check_stmt).first():
-            unique_wallet_number = candidate
-            break
+        check_stmt = select(Wallet.wallet_number).where(Wallet.wallet_number.in_(candidates)) #type: ignore
+        taken = set((await session.exec(check_stmt)).all())
+        unique_wallet_number = next((c for c in candidates if c not in taken), None)
             
     new_wallet = Wallet(
         wallet_number=unique_wallet_number,
@@ -33,7 +39,6 @@ def get_or_create_user(session: Session, email: str, full_name: str) -> User:
         user=new_user
     )
     session.add(new_wallet)
-    session.commit()
-    session.refresh(new_user)
+    await session.commit()
     
     return new_user
\ No newline at end of file
@@ -1,42 +1,62 @@
+import base64
 import secrets
 import hashlib
 from datetime import datetime, timedelta, timezone
 
+API_KEY_BYTES = 32
+
 def generate_api_key(prefix: str = "sk_live_") -> str:
     """
     Generates a secure, random API key.
     Example: sk_live_7f8a9d...
     """
-    random_part = secrets.token_urlsafe(32)
-    return f"{prefix}{random_part}"
+    return prefix + secrets.token_urlsafe(API_KEY_BYTES)
 
-def hash_api_key(key: str) -> str:
+def generate_api_keys(n: int, prefix: str = "sk_live_") -> list[str]:
+    """
+    Bulk form of generate_api_key: one urandom read for all n keys,
+    each encoded the same way token_urlsafe does.
+    """
+    raw = secrets.token_bytes(API_KEY_BYTES * n)
+    return [
+        prefix + base64.urlsafe_b64encode(raw[i:i + API_KEY_BYTES]).rstrip(b"=").decode("ascii")
+        for i in range(0, len(raw), API_KEY_BYTES)
+    ]
+
+def hash_api_key(key: str) -> bytes:
     """
     One-way hashes the API key for storage.
-    We use SHA256.
+    We use SHA256 and keep the raw 32-byte digest.
+    """
+    return hashlib.sha256(key.encode()).digest()
+
+def format_wallet_number(wallet_number: int) -> str:
+    """
+    Wallet numbers are stored as BIGINT; clients always see the
+    zero-padded 10-digit NUBAN form.
     """
-    return hashlib.sha256(key.encode()).hexdigest()
+    return f"{wallet_number:010d}"
+
+EXPIRY_UNITS = {
+    "H": timedelta(hours=1),
+    "D": timedelta(days=1),
+    "M": timedelta(days=30),
+    "Y": timedelta(days=365),
+}
 
 def calculate_expiry(duration: str) -> datetime:
     """
     Parses a duration string (1H, 1D, 1M, 1Y) and returns the future UTC datetime.
     """
-    unit = duration[-1].upper()
+    unit = duration[-1:].upper()
     
     try:
         value = int(duration[:-1])
     except ValueError:
         raise ValueError("Invalid duration format. Use format like '1D', '30D', '1Y'.")
 
-    now = datetime.now(timezone.utc)
-    
-    if unit == "H":
-        return now + timedelta(hours=value)
-    elif unit == "D":
-        return now + timedelta(days=value)
-    elif unit == "M":
-        return now + timedelta(days=value * 30)
-    elif unit == "Y":
-        return now + timedelta(days=value * 365)
-    else:
-        raise ValueError(f"Unknown time unit '{unit}'. Supported: H, D, M, Y")
\ No newline at end of file
+    step = EXPIRY_UNITS.get(unit)
+    if step is None:
+        raise ValueError(f"Unknown time unit '{unit}'. Supported: H, D, M, Y")
+
+    return datetime.now(timezone.utc) + value * step
\ No newline at end of file
@@ -0,0 +1,24 @@
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generates a time-ordered UUID (version 7, RFC 9562).
+    Layout: 48-bit unix ms timestamp | ver | 12 random bits | var | 62 random bits.
+    New keys sort after older ones, so B-tree inserts stay on the rightmost page.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+
+    rand_a = rand >> 68
+    rand_b = rand & ((1 << 62) - 1)
+
+    value = (timestamp_ms & ((1 << 48) - 1)) << 80
+    value |= 0x7 << 76
+    value |= rand_a << 64
+    value |= 0b10 << 62
+    value |= rand_b
+
+    return uuid.UUID(int=value)
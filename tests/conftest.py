@@ -1,57 +1,84 @@
+import os
+import tempfile
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.main import app
-from app.database import get_session
+from app.database import get_session, get_session_factory
 from app.models.core import User, Wallet
 import uuid
 
-sqlite_file_name = "database.db"
-sqlite_url = "sqlite://"
+# The app runs on an AsyncSession while fixtures seed data synchronously,
+# so both engines point at the same on-disk SQLite file.
+sqlite_file_name = os.path.join(tempfile.gettempdir(), "wallet_test.db")
+sqlite_url = f"sqlite:///{sqlite_file_name}"
+async_sqlite_url = f"sqlite+aiosqlite:///{sqlite_file_name}"
 
 engine = create_engine(
-    sqlite_url, 
-    connect_args={"check_same_thread": False}, 
-    poolclass=StaticPool
+    sqlite_url,
+    connect_args={"check_same_thread": False},
+    poolclass=NullPool
 )
+async_engine = create_async_engine(async_sqlite_url, poolclass=NullPool)
+async_session_factory = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+@pytest.fixture(scope="session", autouse=True)
+def create_schema():
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    yield
+    SQLModel.metadata.drop_all(engine)
 
 @pytest.fixture(name="session")
 def session_fixture():
-    SQLModel.metadata.create_all(engine)
     with Session(engine) as session:
         yield session
-    SQLModel.metadata.drop_all(engine)
 
-@pytest.fixture(name="client")
-def client_fixture(session: Session):
-    def get_session_override():
-        return session
+    # The schema lives for the whole run; tests only need empty tables.
+    with engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            conn.execute(table.delete())
 
+async def get_session_override():
+    async with async_session_factory() as async_session:
+        yield async_session
+
+# Not entered as a context manager: the app lifespan would run create_all
+# against the configured production database. Tests own the schema instead.
+@pytest.fixture(scope="session")
+def shared_client():
+    return TestClient(app)
+
+@pytest.fixture(name="client")
+def client_fixture(session: Session, shared_client: TestClient):
     app.dependency_overrides[get_session] = get_session_override
-    client = TestClient(app)
-    yield client
+    app.dependency_overrides[get_session_factory] = lambda: async_session_factory
+    yield shared_client
     app.dependency_overrides.clear()
+    shared_client.cookies.clear()
 
 @pytest.fixture(name="test_user")
 def test_user_fixture(session: Session):
     user_id = uuid.uuid4()
-    
+
     user = User(
         id=user_id,
-        email="test@example.com", 
+        email="test@example.com",
         full_name="Test User"
     )
     session.add(user)
     session.commit()
-    
+
     wallet = Wallet(
-        wallet_number="1234567890", 
-        balance=50000, 
+        wallet_number=1234567890,
+        balance=50000,
         user_id=user_id
     )
     session.add(wallet)
     session.commit()
-    
+
     session.refresh(user)
-    return user
\ No newline at end of file
+    return user
@@ -0,0 +1,48 @@
+import pytest
+from app.cache import api_key_cache
+from app.security import create_access_token
+from app.utils import hash_api_key
+
+def test_api_key_lifecycle(client, session, test_user):
+    token = create_access_token(subject=test_user.id)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    payload = {"name": "ci", "permissions": ["read"], "expiry": "1D"}
+    response = client.post("/keys/create", json=payload, headers=headers)
+
+    assert response.status_code == 200
+    api_key = response.json()["api_key"]
+    key_hash = hash_api_key(api_key)
+
+    response = client.get("/wallet/balance", headers={"x-api-key": api_key})
+    assert response.status_code == 200
+    cached_at, _ = api_key_cache[key_hash]
+
+    # second call is served from the API key cache; a miss would re-stamp it
+    response = client.get("/wallet/balance", headers={"x-api-key": api_key})
+    assert response.status_code == 200
+    assert api_key_cache[key_hash][0] == cached_at
+    assert response.json()["balance"] == 50000
+
+    response = client.get("/keys", headers=headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    etag = response.headers["etag"]
+
+    response = client.get("/keys", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    key_id = client.get("/keys", headers=headers).json()[0]["id"]
+    response = client.post("/keys/revoke", json={"key_id": key_id}, headers=headers)
+    assert response.status_code == 204
+    assert key_hash not in api_key_cache
+
+    response = client.get("/keys", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["is_active"] is False
+
+    response = client.post("/keys/revoke", json={"key_id": key_id}, headers=headers)
+    assert response.status_code == 204
+
+    response = client.get("/wallet/balance", headers={"x-api-key": api_key})
+    assert response.status_code == 401
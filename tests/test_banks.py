@@ -0,0 +1,30 @@
+from app.main import app
+from app.services.paystack import get_paystack
+
+class StubPaystack:
+    def __init__(self, banks: list):
+        self.banks = banks
+
+    async def get_banks(self):
+        return self.banks
+
+def test_banks_etag(client):
+    banks = [{"name": "Access Bank", "code": "044", "slug": "access-bank"}]
+    app.dependency_overrides[get_paystack] = lambda: StubPaystack(banks)
+
+    response = client.get("/banks")
+    assert response.status_code == 200
+    assert response.json() == [{"name": "Access Bank", "code": "044"}]
+    assert response.headers["cache-control"] == "public, max-age=3600"
+    etag = response.headers["etag"]
+
+    response = client.get("/banks", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_banks_failure_not_cached(client):
+    app.dependency_overrides[get_paystack] = lambda: StubPaystack([])
+
+    response = client.get("/banks")
+    assert response.status_code == 502
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
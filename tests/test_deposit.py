@@ -0,0 +1,44 @@
+from app.main import app
+from app.models.core import Transaction, TransactionStatus
+from app.security import create_access_token
+from app.services.paystack import get_paystack
+from sqlmodel import select
+
+class StubPaystack:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    async def initialize_transaction(self, email: str, amount: int, reference: str):
+        if self.fail:
+            raise ValueError("Payment initialization failed")
+        return {
+            "authorization_url": f"https://checkout.paystack.test/{reference}",
+            "access_code": "ac_123",
+            "reference": reference
+        }
+
+def test_deposit_stores_metadata(client, session, test_user):
+    app.dependency_overrides[get_paystack] = lambda: StubPaystack()
+    headers = {"Authorization": f"Bearer {create_access_token(subject=test_user.id)}"}
+
+    response = client.post("/wallet/deposit", json={"amount": 5000}, headers=headers)
+
+    assert response.status_code == 200
+    reference = response.json()["reference"]
+    assert response.json()["authorization_url"].endswith(reference)
+
+    # TestClient runs background tasks before returning the response
+    txn = session.exec(select(Transaction).where(Transaction.reference == reference)).one()
+    assert txn.status == TransactionStatus.PENDING
+    assert txn.meta_data["access_code"] == "ac_123"
+
+def test_deposit_marks_failed_on_paystack_error(client, session, test_user):
+    app.dependency_overrides[get_paystack] = lambda: StubPaystack(fail=True)
+    headers = {"Authorization": f"Bearer {create_access_token(subject=test_user.id)}"}
+
+    response = client.post("/wallet/deposit", json={"amount": 5000}, headers=headers)
+
+    assert response.status_code == 500
+    txn = session.exec(select(Transaction).where(Transaction.wallet_id == test_user.wallet.id)).one()
+    assert txn.status == TransactionStatus.FAILED
+    assert not txn.meta_data
@@ -5,8 +5,8 @@ from app.security import create_access_token
 def test_pagination_flow(client, session, test_user):
     wallet = test_user.wallet
     
-    for i in range(25):
-        txn = Transaction(
+    txns = [
+        Transaction(
             amount=100 + i,
             transaction_type=TransactionType.DEPOSIT,
             status=TransactionStatus.SUCCESS,
@@ -14,7 +14,9 @@ def test_pagination_flow(client, session, test_user):
             wallet_id=wallet.id,
             meta_data={"note": f"Transaction number {i}"}
         )
-        session.add(txn)
+        for i in range(25)
+    ]
+    session.add_all(txns)
     session.commit()
 
     token = create_access_token(subject=test_user.id)
@@ -28,6 +30,13 @@ def test_pagination_flow(client, session, test_user):
     
     assert response.status_code == 200
     assert len(data) == 10
+    assert "meta_data" not in data[0]
+
+    response = client.get(
+        "/wallet/transactions?limit=1&include_meta=true", 
+        headers=headers
+    )
+    assert "note" in response.json()[0]["meta_data"]
     
     response = client.get(
         "/wallet/transactions?limit=10&skip=10", 
@@ -0,0 +1,77 @@
+import asyncio
+import httpx
+import pytest
+from app.services import paystack as paystack_module
+from app.services.paystack import MAX_ATTEMPTS, PaystackService
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(paystack_module, "BACKOFF_BASE_SECONDS", 0)
+    monkeypatch.setattr(paystack_module, "BACKOFF_CAP_SECONDS", 0)
+
+def send(method: str, url: str, outcomes: list) -> tuple[httpx.Response | Exception, int]:
+    """
+    Runs one _request against a mock transport that replays outcomes
+    (status codes or exceptions) in order. Returns the result and the
+    number of attempts the transport saw.
+    """
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        outcome = outcomes[min(len(calls), len(outcomes) - 1)]
+        calls.append(request)
+        if isinstance(outcome, type) and issubclass(outcome, Exception):
+            raise outcome("boom", request=request)
+        return httpx.Response(outcome, json={"status": outcome < 400, "data": {}})
+
+    async def run():
+        service = PaystackService()
+        await service._client.aclose()
+        service._client = httpx.AsyncClient(base_url=service.base_url, transport=httpx.MockTransport(handler))
+        async with service:
+            try:
+                return await service._request(method, url)
+            except Exception as exc:
+                return exc
+
+    return asyncio.run(run()), len(calls)
+
+def test_get_retries_5xx_until_success():
+    response, attempts = send("GET", "/bank", [503, 502, 200])
+    assert response.status_code == 200
+    assert attempts == 3
+
+def test_get_stops_at_attempt_cap():
+    response, attempts = send("GET", "/bank", [503])
+    assert response.status_code == 503
+    assert attempts == MAX_ATTEMPTS
+
+def test_post_transfer_not_replayed_after_5xx():
+    response, attempts = send("POST", "/transfer", [502, 200])
+    assert response.status_code == 502
+    assert attempts == 1
+
+def test_post_retries_429():
+    response, attempts = send("POST", "/transfer", [429, 200])
+    assert response.status_code == 200
+    assert attempts == 2
+
+def test_post_retries_connect_errors():
+    response, attempts = send("POST", "/transfer", [httpx.ConnectError, 200])
+    assert response.status_code == 200
+    assert attempts == 2
+
+def test_connect_errors_stop_at_attempt_cap():
+    error, attempts = send("POST", "/transfer", [httpx.ConnectError])
+    assert isinstance(error, httpx.ConnectError)
+    assert attempts == MAX_ATTEMPTS
+
+def test_post_not_replayed_after_mid_request_error():
+    error, attempts = send("POST", "/transfer", [httpx.ReadTimeout, 200])
+    assert isinstance(error, httpx.ReadTimeout)
+    assert attempts == 1
+
+def test_get_retries_mid_request_error():
+    response, attempts = send("GET", "/bank", [httpx.ReadError, 200])
+    assert response.status_code == 200
+    assert attempts == 2
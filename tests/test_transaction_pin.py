@@ -11,7 +11,7 @@ def test_pin_security_lifecycle(client, session, test_user):
     session.commit()
     
     recipient_wallet = Wallet(
-        wallet_number="0987654321", 
+        wallet_number=987654321, 
         balance=0, 
         user_id=recipient.id
     )
@@ -31,8 +31,7 @@ def test_pin_security_lifecycle(client, session, test_user):
     pin_payload = {"pin": "1234"}
     response = client.post("/auth/set-pin", json=pin_payload, headers=headers)
     
-    assert response.status_code == 200
-    assert response.json()["status"] == "success"
+    assert response.status_code == 204
     
     session.refresh(test_user)
     assert test_user.pin_hash is not None
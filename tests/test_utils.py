@@ -0,0 +1,18 @@
+from app.utils import generate_api_key, generate_api_keys, hash_api_key
+
+def test_generate_api_keys_matches_single_key_format():
+    keys = generate_api_keys(50)
+
+    assert len(keys) == 50
+    assert len(set(keys)) == 50
+    for key in keys:
+        assert key.startswith("sk_live_")
+        assert len(key) == len(generate_api_key()) == 51
+        assert len(hash_api_key(key)) == 32
+
+def test_generate_api_keys_custom_prefix():
+    keys = generate_api_keys(3, prefix="sk_test_")
+
+    assert len(keys) == 3
+    assert all(key.startswith("sk_test_") and len(key) == 51 for key in keys)
+    assert generate_api_keys(0) == []
@@ -0,0 +1,54 @@
+import hmac
+import hashlib
+import json
+import pytest
+from app.config import settings
+from app.models.core import Transaction, TransactionType, TransactionStatus
+from app.models.ledger import LedgerEntry
+from app.models.webhook import WebhookEvent
+from sqlmodel import select
+
+def sign(body: bytes) -> str:
+    return hmac.new(settings.PAYSTACK_SECRET_KEY.encode(), body, hashlib.sha512).hexdigest()
+
+def test_webhook_credits_once(client, session, test_user):
+    txn = Transaction(
+        amount=5000,
+        transaction_type=TransactionType.DEPOSIT,
+        status=TransactionStatus.PENDING,
+        reference="dep-ref-1",
+        wallet_id=test_user.wallet.id
+    )
+    session.add(txn)
+    session.commit()
+
+    body = json.dumps({
+        "event": "charge.success",
+        "data": {"id": 302961, "reference": "dep-ref-1", "amount": 5000}
+    }).encode()
+
+    response = client.post("/wallet/paystack/webhook", content=body, headers={"x-paystack-signature": "0" * 128})
+    assert response.status_code == 400
+
+    response = client.post("/wallet/paystack/webhook", content=body, headers={"x-paystack-signature": "not-hex"})
+    assert response.status_code == 400
+
+    headers = {"x-paystack-signature": sign(body)}
+    response = client.post("/wallet/paystack/webhook", content=body, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "success"
+
+    response = client.post("/wallet/paystack/webhook", content=body, headers=headers)
+    assert response.json()["status"] == "ignored"
+
+    events = session.exec(select(WebhookEvent)).all()
+    assert [event.paystack_event_id for event in events] == ["302961"]
+
+    session.refresh(txn)
+    assert txn.status == TransactionStatus.SUCCESS
+
+    entries = session.exec(select(LedgerEntry).where(LedgerEntry.wallet_id == test_user.wallet.id)).all()
+    assert [entry.amount for entry in entries] == [5000]
+
+    session.refresh(test_user.wallet)
+    assert test_user.wallet.balance == 55000
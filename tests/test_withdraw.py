@@ -0,0 +1,99 @@
+import pytest
+from app.cache import recipient_cache
+from app.main import app
+from app.models.core import Transaction, TransactionType, TransactionStatus, Wallet
+from app.models.recipient import PaystackRecipient
+from app.security import create_access_token, get_pin_hash
+from app.services.paystack import get_paystack
+from sqlmodel import select
+
+class StubPaystack:
+    def __init__(self, recipient_code: str | None = "RCP_test", transfer_ok: bool = True):
+        self.recipient_code = recipient_code
+        self.transfer_ok = transfer_ok
+        self.recipients_created = 0
+        self.transfers = []
+
+    async def create_transfer_recipient(self, name: str, account_number: str, bank_code: str):
+        self.recipients_created += 1
+        return self.recipient_code
+
+    async def initiate_transfer(self, amount: int, recipient_code: str, reference: str, reason: str):
+        self.transfers.append((amount, recipient_code, reference))
+        if not self.transfer_ok:
+            return {"status": False, "message": "Insufficient provider balance"}
+        return {"status": True, "data": {"reference": reference}}
+
+@pytest.fixture(name="headers")
+def headers_fixture(session, test_user):
+    test_user.pin_hash = get_pin_hash("1234")
+    session.add(test_user)
+    session.commit()
+    recipient_cache.clear()
+    yield {"Authorization": f"Bearer {create_access_token(subject=test_user.id)}"}
+    recipient_cache.clear()
+
+def withdraw(client, headers, amount: int = 1000):
+    payload = {
+        "amount": amount,
+        "account_number": "0123456789",
+        "bank_code": "058",
+        "account_name": "Test User",
+        "pin": "1234"
+    }
+    return client.post("/wallet/withdraw", json=payload, headers=headers)
+
+def balance(session, test_user) -> int:
+    session.expire_all()
+    return session.get(Wallet, test_user.wallet.id).balance
+
+def test_withdraw_reuses_stored_recipient(client, session, test_user, headers):
+    paystack = StubPaystack()
+    app.dependency_overrides[get_paystack] = lambda: paystack
+
+    response = withdraw(client, headers)
+    assert response.status_code == 200
+    assert paystack.recipients_created == 1
+    assert balance(session, test_user) == 49000
+
+    recipients = session.exec(select(PaystackRecipient)).all()
+    assert [(r.account_number, r.bank_code, r.recipient_code) for r in recipients] == [("0123456789", "058", "RCP_test")]
+
+    txn = session.exec(select(Transaction).where(Transaction.reference == response.json()["reference"])).one()
+    assert txn.transaction_type == TransactionType.WITHDRAWAL
+    assert txn.status == TransactionStatus.PENDING
+    assert txn.amount == -1000
+
+    # the process cache is gone, so the code has to come from paystack_recipient
+    recipient_cache.clear()
+    response = withdraw(client, headers)
+    assert response.status_code == 200
+    assert paystack.recipients_created == 1
+    assert [transfer[1] for transfer in paystack.transfers] == ["RCP_test", "RCP_test"]
+    assert balance(session, test_user) == 48000
+
+def test_withdraw_refunds_failed_transfer(client, session, test_user, headers):
+    paystack = StubPaystack(transfer_ok=False)
+    app.dependency_overrides[get_paystack] = lambda: paystack
+
+    response = withdraw(client, headers)
+    assert response.status_code == 502
+    assert balance(session, test_user) == 50000
+    assert session.exec(select(Transaction)).all() == []
+
+def test_withdraw_refunds_failed_recipient(client, session, test_user, headers):
+    paystack = StubPaystack(recipient_code=None)
+    app.dependency_overrides[get_paystack] = lambda: paystack
+
+    response = withdraw(client, headers)
+    assert response.status_code == 500
+    assert paystack.transfers == []
+    assert balance(session, test_user) == 50000
+    assert session.exec(select(PaystackRecipient)).all() == []
+
+def test_withdraw_insufficient_funds(client, session, test_user, headers):
+    app.dependency_overrides[get_paystack] = lambda: StubPaystack()
+
+    response = withdraw(client, headers, amount=50001)
+    assert response.status_code == 400
+    assert balance(session, test_user) == 50000